@@ -0,0 +1,57 @@
+# cython: language_level=3
+"""Compiled versions of the TagObject methods which are called for every
+modifier/target pair. TagObject inherits from TagObjectBase if this extension
+has been built, otherwise from the pure-Python _PyTagObjectBase in tag_object.py.
+"""
+cimport cython
+
+
+@cython.auto_pickle(False)
+cdef class TagObjectBase:
+    cdef public int start, end
+    cdef public int _scope_start, _scope_end
+    cdef public object _allowed_type_ids, _excluded_type_ids
+
+    cpdef bint allows(self, target_label):
+        """Returns True if a modifier is able to modify a target type.
+        A modifier may not be allowed if either self.allowed_types is not None and
+        target_label is not in it, or if self.excluded_types is not None and
+        target_label is in it.
+
+        target_label (int): The StringStore ID of the upper-cased target label.
+        """
+        if self._allowed_type_ids is not None:
+            return target_label in self._allowed_type_ids
+        if self._excluded_type_ids is not None:
+            return target_label not in self._excluded_type_ids
+        return True
+
+    cpdef bint overlaps(self, other):
+        """ Returns whether the object overlaps with another span
+
+        other (): the other object to check for overlaps
+
+        RETURNS: true if there is overlap, false otherwise.
+        """
+        return self.start < other.end and other.start < self.end
+
+    cpdef bint overlaps_target(self, target):
+        """Returns True if self overlaps with a spaCy span."""
+        return self.start < target.end and target.start < self.end
+
+    cpdef bint _modifies(self, int target_start, int target_end, target_label):
+        """Returns True if a target with the given token indices and label
+        does not overlap with self, is an allowed type, and is within the modifier scope.
+        """
+        # If the target and modifier overlap, meaning at least one token
+        # one extracted as both a target and modifier, return False
+        # to avoid self-modifying concepts
+        if self.start < target_end and target_start < self.end:
+            return False
+        if not self.allows(target_label):
+            return False
+        # Check whether the first or last token of the target is in scope
+        return (
+            self._scope_start <= target_start < self._scope_end
+            or self._scope_start < target_end <= self._scope_end
+        )
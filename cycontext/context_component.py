@@ -1,4 +1,5 @@
 """The ConTextComponent definiton."""
+import sys
 from os import path
 
 # Filepath to default rules which are included in package
@@ -7,7 +8,7 @@ from pathlib import Path
 from spacy.matcher import Matcher, PhraseMatcher
 from spacy.tokens import Doc, Span
 
-from .tag_object import TagObject
+from .tag_object import TagObject, sentence_bounds
 from .context_graph import ConTextGraph
 from .context_item import ConTextItem
 
@@ -288,9 +289,11 @@ class ConTextComponent:
                     setattr(item, attr, value)
 
             # Check custom termination points
-            if item.category.upper() in self.terminations:
-                for other_modifier in self.terminations[item.category.upper()]:
-                    item.terminated_by.add(other_modifier.upper())
+            if item.category in self.terminations:
+                item.terminated_by = item.terminated_by.union(
+                    sys.intern(other_modifier.upper())
+                    for other_modifier in self.terminations[item.category]
+                )
 
     def register_default_attributes(self):
         """Register the default values for the Span attributes defined in DEFAULT_ATTRS."""
@@ -363,10 +366,12 @@ class ConTextComponent:
 
         # Sort matches
         matches = sorted(matches, key=lambda x: x[1])
+        # Find the sentence boundaries once for all of the modifiers in the Doc
+        sent_bounds = sentence_bounds(doc) if matches else None
         for (match_id, start, end) in matches:
             # Get the ConTextItem object defining this modifier
             item_data = self._modifier_item_mapping[match_id]
-            tag_object = TagObject(item_data, start, end, doc)
+            tag_object = TagObject(item_data, start, end, doc, sent_bounds)
             context_graph.modifiers.append(tag_object)
 
         if self.prune:
@@ -1,3 +1,8 @@
+from bisect import bisect_right
+
+from .tag_object import target_label_id
+
+
 class ConTextGraph:
     def __init__(self, remove_overlapping_modifiers=False):
         self.targets = []
@@ -16,13 +21,19 @@ class ConTextGraph:
         Args:
             marked_modifiers: A list of TagObjects in a Doc.
         """
-        for i in range(len(self.modifiers) - 1):
-            modifier1 = self.modifiers[i]
-            for j in range(i + 1, len(self.modifiers)):
-                modifier2 = self.modifiers[j]
-                # TODO: Add modifier -> modifier edges
-                modifier1.limit_scope(modifier2)
-                modifier2.limit_scope(modifier1)
+        # Modifiers can only limit the scope of other modifiers in the same sentence,
+        # so only compare modifiers within each sentence
+        sentences = dict()
+        for modifier in self.modifiers:
+            sentences.setdefault(modifier._sent_start, []).append(modifier)
+        for modifiers in sentences.values():
+            for i in range(len(modifiers) - 1):
+                modifier1 = modifiers[i]
+                for j in range(i + 1, len(modifiers)):
+                    modifier2 = modifiers[j]
+                    # TODO: Add modifier -> modifier edges
+                    modifier1.limit_scope(modifier2)
+                    modifier2.limit_scope(modifier1)
 
     def apply_modifiers(self):
         """Checks each target/modifier pair. If modifier modifies target,
@@ -44,9 +55,11 @@ class ConTextGraph:
                         break
 
         edges = []
+        modifier_index = ModifierIndex(self.modifiers)
         for target in self.targets:
-            for modifier in self.modifiers:
-                if modifier.modifies(target):
+            target_label = target_label_id(target)
+            for modifier in modifier_index.query(target):
+                if modifier.modifies(target, target_label):
                     modifier.modify(target)
 
         # Now do a second pass and reduce the number of targets
@@ -119,6 +132,77 @@ class ConTextGraph:
         )
 
 
+class ModifierIndex:
+    """An index of TagObjects used to find the modifiers whose scope may contain a target
+    without checking every modifier in a Doc. Modifiers are binned by the sentence
+    they occur in and sorted by the end of their scope within each sentence.
+    """
+
+    def __init__(self, modifiers):
+        """Create a new ModifierIndex.
+
+        Args:
+            modifiers: A list of TagObjects in a Doc.
+        """
+        bins = dict()
+        # Modifiers whose scope has been updated to cross a sentence boundary
+        # can't be binned by sentence and are always returned by query
+        self._unbinned = []
+        for modifier in modifiers:
+            sent_start, sent_end = modifier._sent_start, modifier._sent_end
+            if sent_start <= modifier._scope_start and modifier._scope_end <= sent_end:
+                bins.setdefault((sent_start, sent_end), []).append(modifier)
+            else:
+                self._unbinned.append(modifier)
+
+        self._sent_starts = []
+        self._sent_ends = []
+        self._scope_ends = []
+        self._bins = []
+        for (sent_start, sent_end) in sorted(bins):
+            sent_modifiers = sorted(bins[(sent_start, sent_end)], key=lambda x: x._scope_end)
+            self._sent_starts.append(sent_start)
+            self._sent_ends.append(sent_end)
+            self._scope_ends.append([modifier._scope_end for modifier in sent_modifiers])
+            self._bins.append(sent_modifiers)
+
+    def query(self, target):
+        """Returns the modifiers whose scope overlaps with a target.
+        This is a superset of the modifiers which modify the target,
+        so TagObject.modifies should still be called on each of them.
+
+        Args:
+            target: a spaCy Span
+
+        Returns:
+            modifiers: a list of TagObjects
+        """
+        candidates = list(self._unbinned)
+        # Since a modifier's scope is within its sentence, only the sentences
+        # containing the first and last token of the target need to be checked
+        bin_indices = {
+            self._find_bin(target.start),
+            self._find_bin(target.end - 1),
+        }
+        for i in bin_indices:
+            if i is None:
+                continue
+            scope_ends = self._scope_ends[i]
+            sent_modifiers = self._bins[i]
+            for j in range(bisect_right(scope_ends, target.start), len(sent_modifiers)):
+                modifier = sent_modifiers[j]
+                if modifier._scope_start < target.end:
+                    candidates.append(modifier)
+        return candidates
+
+    def _find_bin(self, token_index):
+        """Returns the index of the sentence bin containing a token index, or None."""
+        i = bisect_right(self._sent_starts, token_index) - 1
+        if i >= 0 and token_index < self._sent_ends[i]:
+            return i
+        return None
+
+
 def overlap_target_modifiers(span1, span2):
     """Checks whether two modifiers overlap.
         
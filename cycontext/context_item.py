@@ -1,4 +1,50 @@
 import json
+import operator
+import sys
+
+from spacy.strings import hash_string
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency for faster reading and writing
+    orjson = None
+
+# Rules and categories are interned so that comparisons between them can short-circuit on identity
+FORWARD = sys.intern("FORWARD")
+BACKWARD = sys.intern("BACKWARD")
+BIDIRECTIONAL = sys.intern("BIDIRECTIONAL")
+TERMINATE = sys.intern("TERMINATE")
+MAX_TARGETS = sys.intern("MAX_TARGETS")
+MAX_SCOPE = sys.intern("MAX_SCOPE")
+
+# Attributes written by ConTextItem.to_dict, in order
+_SERIALIZE_KEYS = (
+    "literal",
+    "rule",
+    "pattern",
+    "category",
+    "metadata",
+    "allowed_types",
+    "excluded_types",
+    "terminated_by",
+)
+_SERIALIZE_GETTER = operator.attrgetter(*_SERIALIZE_KEYS)
+
+# Attributes saved when a ConTextItem is pickled. The StringStore hashes of
+# allowed_types and excluded_types are recomputed by their setters.
+_PICKLE_ATTRS = (
+    "literal",
+    "category",
+    "pattern",
+    "rule",
+    "on_match",
+    "allowed_types",
+    "excluded_types",
+    "max_targets",
+    "max_scope",
+    "terminated_by",
+    "metadata",
+)
 
 
 class ConTextItem:
@@ -7,12 +53,12 @@ class ConTextItem:
     """
 
     _ALLOWED_RULES = (
-        "FORWARD",
-        "BACKWARD",
-        "BIDIRECTIONAL",
-        "TERMINATE",
-        "MAX_TARGETS",
-        "MAX_SCOPE",
+        FORWARD,
+        BACKWARD,
+        BIDIRECTIONAL,
+        TERMINATE,
+        MAX_TARGETS,
+        MAX_SCOPE,
     )
     _ALLOWED_KEYS = {
         "literal",
@@ -21,9 +67,26 @@ class ConTextItem:
         "category",
         "metadata",
         "allowed_types",
-        "filtered_types",
+        "excluded_types",
+        "terminated_by",
     }
 
+    __slots__ = (
+        "literal",
+        "category",
+        "pattern",
+        "rule",
+        "on_match",
+        "_allowed_types",
+        "_excluded_types",
+        "max_targets",
+        "max_scope",
+        "terminated_by",
+        "metadata",
+        "_allowed_type_ids",
+        "_excluded_type_ids",
+    )
+
     def __init__(
         self,
         literal,
@@ -62,6 +125,7 @@ class ConTextItem:
             max_scope (int or None): A number to explicitly limit the size of the modifier's scope
             terminated_by (iterable or None): An optional array of other modifier categories which will
                 terminate the scope of this modifier. If None, only "TERMINATE" will do this.
+                Stored as a frozenset of upper-cased categories.
             metadata (dict or None): A dict of additional data to pass in,
                 such as free-text comments, additional attributes, or ICD-10 codes.
                 Default None.
@@ -70,9 +134,9 @@ class ConTextItem:
             item: a ConTextItem
         """
         self.literal = literal.lower()
-        self.category = category.upper()
+        self.category = sys.intern(category.upper())
         self.pattern = pattern
-        self.rule = rule.upper()
+        self.rule = sys.intern(rule.upper())
         self.on_match = on_match
 
         if allowed_types is not None and excluded_types is not None:
@@ -80,14 +144,8 @@ class ConTextItem:
                 "A ConTextItem was instantiated with non-null values for both allowed_types and excluded_types. "
                 "Only one of these can be non-null, since cycontext either explicitly includes or excludes target types."
             )
-        if allowed_types is not None:
-            self.allowed_types = {label.upper() for label in allowed_types}
-        else:
-            self.allowed_types = None
-        if excluded_types is not None:
-            self.excluded_types = {label.upper() for label in excluded_types}
-        else:
-            self.excluded_types = None
+        self.allowed_types = allowed_types
+        self.excluded_types = excluded_types
 
         if max_targets is not None and max_targets <= 0:
             raise ValueError("max_targets must be >= 0 or None.")
@@ -96,13 +154,10 @@ class ConTextItem:
             raise ValueError("max_scope must be >= 0 or None.")
         self.max_scope = max_scope
         if terminated_by is None:
-            terminated_by = set()
-        else:
-            if isinstance(terminated_by, str):
-                raise ValueError("terminated_by must be an iterable, such as a list or set, not {}.".format(terminated_by))
-            terminated_by = {string.upper() for string in terminated_by}
-
-        self.terminated_by = terminated_by
+            terminated_by = ()
+        elif isinstance(terminated_by, str):
+            raise ValueError("terminated_by must be an iterable, such as a list or set, not {}.".format(terminated_by))
+        self.terminated_by = frozenset(sys.intern(string.upper()) for string in terminated_by)
 
         self.metadata = metadata
 
@@ -113,6 +168,24 @@ class ConTextItem:
                 )
             )
 
+    @property
+    def allowed_types(self):
+        """The set of upper-cased target labels which this modifier can modify, or None."""
+        return self._allowed_types
+
+    @allowed_types.setter
+    def allowed_types(self, allowed_types):
+        self._allowed_types, self._allowed_type_ids = _normalize_types(allowed_types)
+
+    @property
+    def excluded_types(self):
+        """The set of upper-cased target labels which this modifier cannot modify, or None."""
+        return self._excluded_types
+
+    @excluded_types.setter
+    def excluded_types(self, excluded_types):
+        self._excluded_types, self._excluded_type_ids = _normalize_types(excluded_types)
+
     @classmethod
     def from_json(cls, filepath):
         """Read in a lexicon of modifiers from a JSON file.
@@ -127,8 +200,12 @@ class ConTextItem:
                 those accepted by ConTextItem.__init__
         """
 
-        with open(filepath) as file:
-            modifier_data = json.load(file)
+        if orjson is not None:
+            with open(filepath, "rb") as file:
+                modifier_data = orjson.loads(file.read())
+        else:
+            with open(filepath) as file:
+                modifier_data = json.load(file)
         item_data = []
         for data in modifier_data["item_data"]:
             item_data.append(ConTextItem.from_dict(data))
@@ -170,8 +247,12 @@ class ConTextItem:
         """
 
         data = {"item_data": [item.to_dict() for item in item_data]}
-        with open(filepath, "w") as file:
-            json.dump(data, file, indent=4)
+        if orjson is not None:
+            with open(filepath, "wb") as file:
+                file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, "w") as file:
+                json.dump(data, file, indent=4)
 
     def to_dict(self):
         """Converts ConTextItems to a python dictionary. Used when writing context items to a json file.
@@ -179,10 +260,31 @@ class ConTextItem:
         Returns:
             item_dict: the dictionary containing the ConTextItem info.
         """
-        item_dict = {}
-        for key in self._ALLOWED_KEYS:
-            item_dict[key] = self.__dict__.get(key)
+        item_dict = dict(zip(_SERIALIZE_KEYS, _SERIALIZE_GETTER(self)))
+        # Sets can't be written to json
+        for key in ("allowed_types", "excluded_types", "terminated_by"):
+            if item_dict[key] is not None:
+                item_dict[key] = sorted(item_dict[key])
         return item_dict
 
+    def __getstate__(self):
+        return {attr: getattr(self, attr) for attr in _PICKLE_ATTRS}
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     def __repr__(self):
         return f"ConTextItem(literal='{self.literal}', category='{self.category}', pattern={self.pattern}, rule='{self.rule}')"
+
+
+def _normalize_types(types):
+    """Returns a set of interned, upper-cased target labels and a frozenset of their
+    StringStore hashes, which target labels are compared against. StringStore hashes
+    don't depend on the Vocab, so they can be computed without one.
+    Returns (None, None) if types is None.
+    """
+    if types is None:
+        return None, None
+    types = {sys.intern(label.upper()) for label in types}
+    return types, frozenset(hash_string(label) for label in types)
@@ -0,0 +1,61 @@
+"""Helper functions for applying cycontext to many documents at once."""
+from .context_component import ConTextComponent
+
+
+def tag_documents(nlp, texts, context=None, n_process=1, batch_size=64):
+    """Process texts with a spaCy pipeline and apply ConText to each Doc.
+
+    The pipeline components which run before ConText, such as the parser and NER,
+    are run in batches with nlp.pipe and can be split across multiple processes.
+    ConText and any components after it are then applied to each Doc in order
+    in the main process, since spaCy sends Docs between processes with Doc.to_bytes,
+    which can't serialize the TagObjects and ConTextGraph stored in
+    Doc._.context_graph and Span._.modifiers.
+
+    Using multiple processes has the overhead of starting the workers and
+    serializing every Doc, so it is only faster when the upstream pipeline is
+    expensive (ie., a statistical parser or NER model) and there are many texts.
+    For small pipelines or few texts, n_process=1 is usually faster.
+
+    Args:
+        nlp: a spaCy Language object
+        texts: an iterable of strings to process
+        context: the ConTextComponent to apply to each Doc. If None, will use the
+            component named "context" in nlp's pipeline.
+            If context is not in nlp's pipeline, it will be applied after the
+            whole pipeline.
+        n_process: the number of processes to use in nlp.pipe. Default 1.
+        batch_size: the number of texts to buffer in nlp.pipe. Default 64.
+
+    Yields:
+        doc: a spaCy Doc which has been processed by ConText
+
+    Raises:
+        ValueError: if context is None and nlp doesn't contain a ConTextComponent.
+    """
+    if context is None:
+        if ConTextComponent.name not in nlp.pipe_names:
+            raise ValueError(
+                "context must be a ConTextComponent if nlp does not contain one named '{0}'.".format(
+                    ConTextComponent.name
+                )
+            )
+        context = nlp.get_pipe(ConTextComponent.name)
+
+    # Split the pipeline into the components before context, which are run by nlp.pipe,
+    # and context and the components after it, which are run in the main process
+    for (i, (name, component)) in enumerate(nlp.pipeline):
+        if component is context:
+            disable = nlp.pipe_names[i:]
+            components = [component for (name, component) in nlp.pipeline[i:]]
+            break
+    else:
+        disable = []
+        components = [context]
+
+    for doc in nlp.pipe(
+        texts, disable=disable, n_process=n_process, batch_size=batch_size
+    ):
+        for component in components:
+            doc = component(doc)
+        yield doc
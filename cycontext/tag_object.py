@@ -1,91 +1,228 @@
-class TagObject:
+import heapq
+from bisect import bisect_right
+
+from spacy.strings import hash_string
+from spacy.tokens import Span
+
+from .context_item import (
+    FORWARD,
+    BACKWARD,
+    BIDIRECTIONAL,
+    TERMINATE,
+    MAX_TARGETS,
+    MAX_SCOPE,
+)
+
+# Rules whose scope extends forward or backward from the modifier
+_FORWARD_RULES = frozenset((FORWARD, BIDIRECTIONAL))
+_BACKWARD_RULES = frozenset((BACKWARD, BIDIRECTIONAL))
+
+# Attributes stored on the base class of TagObject
+_BASE_ATTRS = (
+    "start",
+    "end",
+    "_scope_start",
+    "_scope_end",
+    "_allowed_type_ids",
+    "_excluded_type_ids",
+)
+
+
+class _PyTagObjectBase:
+    """The TagObject methods which are called for every modifier/target pair.
+    A compiled version is defined in _tag_object.pyx and will be used instead
+    if the extension has been built.
+    """
+
+    __slots__ = _BASE_ATTRS
+
+    def allows(self, target_label):
+        """Returns True if a modifier is able to modify a target type.
+        A modifier may not be allowed if either self.allowed_types is not None and
+        target_label is not in it, or if self.excluded_types is not None and
+        target_label is in it.
+
+        target_label (int): The StringStore ID of the upper-cased target label.
+        """
+        if self._allowed_type_ids is not None:
+            return target_label in self._allowed_type_ids
+        if self._excluded_type_ids is not None:
+            return target_label not in self._excluded_type_ids
+        return True
+
+    def overlaps(self, other):
+        """ Returns whether the object overlaps with another span
+
+        other (): the other object to check for overlaps
+
+        RETURNS: true if there is overlap, false otherwise.
+        """
+        return self.start < other.end and other.start < self.end
+
+    def overlaps_target(self, target):
+        """Returns True if self overlaps with a spaCy span."""
+        return self.start < target.end and target.start < self.end
+
+    def _modifies(self, target_start, target_end, target_label):
+        """Returns True if a target with the given token indices and label
+        does not overlap with self, is an allowed type, and is within the modifier scope.
+        """
+        # If the target and modifier overlap, meaning at least one token
+        # one extracted as both a target and modifier, return False
+        # to avoid self-modifying concepts
+        if self.start < target_end and target_start < self.end:
+            return False
+        if not self.allows(target_label):
+            return False
+        # Check whether the first or last token of the target is in scope
+        scope_start, scope_end = self._scope_start, self._scope_end
+        return (
+            scope_start <= target_start < scope_end
+            or scope_start < target_end <= scope_end
+        )
+
+
+def _closest_targets(modifier_start, modifier_end, starts, ends, k):
+    """Returns the indices of the k targets closest to a modifier, ordered by distance
+    and then by the order of the targets. This is compiled with numba if it is installed,
+    and is only used then.
+
+    modifier_start (int): The start token index of the modifier.
+    modifier_end (int): The end token index of the modifier.
+    starts (ndarray): The start token indices of the targets.
+    ends (ndarray): The end token indices of the targets.
+    k (int): The number of targets to keep. Must be less than the number of targets.
+    """
+    n = starts.shape[0]
+    # Combine the distance and index into a single key so that ties are broken by index.
+    # heap is a max-heap of the k smallest keys seen so far.
+    heap = np.empty(k, dtype=np.int64)
+    size = 0
+    for i in range(n):
+        dist = min(abs(modifier_start - ends[i]), abs(starts[i] - modifier_end))
+        key = dist * n + i
+        if size < k:
+            # Sift the new key up from the bottom of the heap
+            j = size
+            size += 1
+            while j > 0:
+                parent = (j - 1) // 2
+                if heap[parent] >= key:
+                    break
+                heap[j] = heap[parent]
+                j = parent
+            heap[j] = key
+        elif key < heap[0]:
+            # Replace the largest key and sift the new key down
+            j = 0
+            while True:
+                child = 2 * j + 1
+                if child >= k:
+                    break
+                if child + 1 < k and heap[child + 1] > heap[child]:
+                    child += 1
+                if heap[child] <= key:
+                    break
+                heap[j] = heap[child]
+                j = child
+            heap[j] = key
+    return np.sort(heap[:size]) % n
+
+
+# Number of targets above which reduce_targets uses the compiled _closest_targets.
+# For fewer targets heapq.nsmallest is fast enough.
+_JIT_MIN_TARGETS = 64
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional dependency
+    _closest_targets_jit = None
+else:
+    # numpy is only needed by _closest_targets, and is installed with numba
+    import numpy as np
+
+    _closest_targets_jit = njit(cache=True, fastmath=True)(_closest_targets)
+
+
+try:
+    from ._tag_object import TagObjectBase as _TagObjectBase
+except ImportError:  # The Cython extension has not been built
+    _TagObjectBase = _PyTagObjectBase
+
+
+class TagObject(_TagObjectBase):
     """Represents a concept found by ConText in a document.
     Is the result of ConTextItem matching a span of text in a Doc.
     """
 
-    def __init__(self, context_item, start, end, doc):
+    __slots__ = (
+        "context_item",
+        "rule",
+        "category",
+        "allowed_types",
+        "excluded_types",
+        "max_targets",
+        "max_scope",
+        "doc",
+        "_span",
+        "_targets",
+        "_num_targets",
+        "_sent_start",
+        "_sent_end",
+        "_scope_span",
+    )
+
+    def __init__(self, context_item, start, end, doc, sent_bounds=None):
         """Create a new TagObject from a document span.
 
         context_item (int): The ConTextItem object which defines the modifier.
         start (int): The start token index.
         end (int): The end token index (non-inclusive).
         doc (Doc): The spaCy Doc which contains this span.
+        sent_bounds (tuple): Optional. The sentence start and end token indices
+            of doc returned by sentence_bounds(doc). If None, they will be computed.
         """
         self.context_item = context_item
+        self.rule = context_item.rule
+        self.category = context_item.category
+        self.allowed_types = context_item.allowed_types
+        self.excluded_types = context_item.excluded_types
+        self.max_targets = context_item.max_targets
+        self.max_scope = context_item.max_scope
         self.start = start
         self.end = end
         self.doc = doc
+        self._span = doc[start:end]
 
         self._targets = []
         self._num_targets = 0
 
-        self._scope_start = None
-        self._scope_end = None
+        self._sent_start = None
+        self._sent_end = None
 
-        self.set_scope()
+        self._scope_span = None
 
-    @property
-    def span(self):
-        """The spaCy Span object, which is a view of self.doc, covered by this match."""
-        return self.doc[self.start : self.end]
+        self._allowed_type_ids = context_item._allowed_type_ids
+        self._excluded_type_ids = context_item._excluded_type_ids
 
-    @property
-    def rule(self):
-        """Returns the associated rule."""
-        return self.context_item.rule
+        self.set_scope(sent_bounds)
 
     @property
-    def category(self):
-        """Returns the associated category."""
-        return self.context_item.category
+    def span(self):
+        """The spaCy Span object, which is a view of self.doc, covered by this match."""
+        return self._span
 
     @property
     def scope(self):
         """Returns the associated scope."""
-        return self.doc[self._scope_start : self._scope_end]
-
-    @property
-    def allowed_types(self):
-        """Returns the associated allowed types."""
-        return self.context_item.allowed_types
-
-    @property
-    def excluded_types(self):
-        """Returns the associated excluded types."""
-        return self.context_item.excluded_types
+        return self._scope_span
 
     @property
     def num_targets(self):
         """Returns the associated number of targets."""
         return self._num_targets
 
-    @property
-    def max_targets(self):
-        """Returns the associated maximum number of targets."""
-        return self.context_item.max_targets
-
-    @property
-    def max_scope(self):
-        """Returns the associated maximum scope."""
-        return self.context_item.max_scope
-
-    def allows(self, target_label):
-        """Returns True if a modifier is able to modify a target type.
-        A modifier may not be allowed if either self.allowed_types is not None and
-        target_label is not in it, or if self.excluded_types is not None and
-        target_label is in it.
-        """
-        if self.allowed_types is not None:
-            if target_label not in self.allowed_types:
-                return False
-            return True
-        if self.excluded_types is not None:
-            if target_label not in self.excluded_types:
-                return True
-            return False
-        return True
-
-    def set_scope(self):
+    def set_scope(self, sent_bounds=None):
         """Applies the rule of the ConTextItem which generated
         this TagObject to define a scope.
         If self.max_scope is None, then the default scope is the sentence which it occurs in
@@ -96,46 +233,20 @@ class TagObject:
         If self.max_scope is not None and the length of the default scope is longer than self.max_scope,
         it will be reduced to self.max_scope.
 
-
+        sent_bounds (tuple): Optional. The sentence start and end token indices
+            of self.doc returned by sentence_bounds(self.doc). If None, only the
+            sentence containing this TagObject will be found.
         """
-        sent = self.doc[self.start].sent
-        if sent is None:
-            raise ValueError(
-                "ConText failed because sentence boundaries have not been set. "
-                "Add an upstream component such as the dependency parser, Sentencizer, or PyRuSH to detect sentence boundaries."
-            )
+        if sent_bounds is None:
+            sent = _token_sent(self.doc[self.start])
+            self._sent_start, self._sent_end = sent.start, sent.end
+        else:
+            sent_starts, sent_ends = sent_bounds
+            i = bisect_right(sent_ends, self.start)
+            self._sent_start, self._sent_end = sent_starts[i], sent_ends[i]
 
-        if self.rule.lower() == "forward":
-            self._scope_start, self._scope_end = self.end, sent.end
-            if (
-                self.max_scope is not None
-                and (self._scope_end - self._scope_start) > self.max_scope
-            ):
-                self._scope_end = self.end + self.max_scope
-
-        elif self.rule.lower() == "backward":
-            self._scope_start, self._scope_end = sent.start, self.start
-            if (
-                self.max_scope is not None
-                and (self._scope_end - self._scope_start) > self.max_scope
-            ):
-                self._scope_start = self.start - self.max_scope
-        else:  # bidirectional
-            self._scope_start, self._scope_end = sent.start, sent.end
-
-            # Set the max scope on either side
-            # Backwards
-            if (
-                self.max_scope is not None
-                and (self.start - self._scope_start) > self.max_scope
-            ):
-                self._scope_start = self.start - self.max_scope
-            # Forwards
-            if (
-                self.max_scope is not None
-                and (self._scope_end - self.end) > self.max_scope
-            ):
-                self._scope_end = self.end + self.max_scope
+        _SCOPE_SETTERS[self.rule](self, self._sent_start, self._sent_end)
+        self._scope_span = self.doc[self._scope_start : self._scope_end]
 
     def update_scope(self, span):
         """Change the scope of self to be the given spaCy span.
@@ -144,6 +255,7 @@ class TagObject:
         which a modifier should cover.
         """
         self._scope_start, self._scope_end = span.start, span.end
+        self._scope_span = self.doc[self._scope_start : self._scope_end]
 
     def limit_scope(self, other):
         """If self and obj have the same category
@@ -159,14 +271,17 @@ class TagObject:
         other (TagObject)
         Returns True if obj modfified the scope of self
         """
-        if self.span.sent != other.span.sent:
+        # Both TagObjects are in the same Doc, so their sentences
+        # are the same if they start at the same token
+        if self._sent_start != other._sent_start:
             return False
-        if self.rule.upper() == "TERMINATE":
+        rule = self.rule
+        if rule == TERMINATE:
             return False
         # Check if the other modifier is a type which can modify self
         # or if they are the same category. If not, don't reduce scope.
-        if (other.rule.upper() != "TERMINATE") and (other.category.upper() not in self.context_item.terminated_by) and (
-            other.category.upper() != self.category.upper()
+        if (other.rule != TERMINATE) and (other.category not in self.context_item.terminated_by) and (
+            other.category != self.category
         ):
             return False
 
@@ -177,36 +292,31 @@ class TagObject:
         ):
             return False
 
-        orig_scope = self.scope
-        if self.rule.lower() in ("forward", "bidirectional"):
+        orig_scope_start, orig_scope_end = self._scope_start, self._scope_end
+        if rule in _FORWARD_RULES:
             if other > self:
                 self._scope_end = min(self._scope_end, other.start)
-        if self.rule.lower() in ("backward", "bidirectional"):
+        if rule in _BACKWARD_RULES:
             if other < self:
                 self._scope_start = max(self._scope_start, other.end)
-        return orig_scope != self.scope
+        if (self._scope_start, self._scope_end) == (orig_scope_start, orig_scope_end):
+            return False
+        self._scope_span = self.doc[self._scope_start : self._scope_end]
+        return True
 
-    def modifies(self, target):
+    def modifies(self, target, target_label=None):
         """Returns True if the target is within the modifier scope
         and self is allowed to modify target.
 
         target (Span): a spaCy span representing a target concept.
+        target_label (int or None): The StringStore ID of the upper-cased target label.
+            If None, it will be looked up from target.
         """
-        # If the target and modifier overlap, meaning at least one token
-        # one extracted as both a target and modifier, return False
-        # to avoid self-modifying concepts
-
-        if self.overlaps_target(target):
+        if self.rule == TERMINATE:
             return False
-        if self.rule == "TERMINATE":
-            return False
-        if not self.allows(target.label_.upper()):
-            return False
-        if target[0] in self.scope:
-            return True
-        if target[-1] in self.scope:
-            return True
-        return False
+        if target_label is None:
+            target_label = target_label_id(target)
+        return self._modifies(target.start, target.end, target_label)
 
     def modify(self, target):
         """Add target to the list of self._targets and increment self._num_targets."""
@@ -221,51 +331,152 @@ class TagObject:
         if self.max_targets is None or self.num_targets <= self.max_targets:
             return
 
-        target_dists = []
-        for target in self._targets:
-            dist = min(abs(self.start - target.end), abs(target.start - self.end))
-            target_dists.append((target, dist))
-        srtd_targets, _ = zip(*sorted(target_dists, key=lambda x: x[1]))
-        self._targets = srtd_targets[: self.max_targets]
+        num_targets = len(self._targets)
+        if _closest_targets_jit is not None and num_targets > _JIT_MIN_TARGETS:
+            starts = np.fromiter(
+                (target.start for target in self._targets), dtype=np.int64, count=num_targets
+            )
+            ends = np.fromiter(
+                (target.end for target in self._targets), dtype=np.int64, count=num_targets
+            )
+            closest = _closest_targets_jit(
+                self.start, self.end, starts, ends, self.max_targets
+            )
+            self._targets = [self._targets[i] for i in closest]
+        else:
+            # heapq.nsmallest is stable, so ties are kept in the order the targets were added
+            start, end = self.start, self.end
+            self._targets = heapq.nsmallest(
+                self.max_targets,
+                self._targets,
+                key=lambda target: min(abs(start - target.end), abs(target.start - end)),
+            )
         self._num_targets = len(self._targets)
 
-    def overlaps(self, other):
-        """ Returns whether the object overlaps with another span
-
-        other (): the other object to check for overlaps
-
-        RETURNS: true if there is overlap, false otherwise.
-        """
-        return (
-            self.span[0] in other.span
-            or self.span[-1] in other.span
-            or other.span[0] in self.span
-            or other.span[-1] in self.span
-        )
-
-    def overlaps_target(self, target):
-        """Returns True if self overlaps with a spaCy span."""
-        return (
-            self.span[0] in target
-            or self.span[-1] in target
-            or target[0] in self.span
-            or target[-1] in self.span
-        )
-
+    def __getstate__(self):
+        # Attributes of a compiled base class aren't pickled by default,
+        # and spaCy Spans can't be pickled, so store targets by their token indices
+        # and rebuild the Span views from self.doc when unpickling
+        state = {
+            attr: getattr(self, attr)
+            for attr in _BASE_ATTRS + self.__slots__
+            if attr not in ("_span", "_scope_span", "_targets")
+        }
+        state["_targets"] = [
+            (target.start, target.end, target.label) for target in self._targets
+        ]
+        return state
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self._targets = [
+            Span(self.doc, start, end, label=label)
+            for (start, end, label) in self._targets
+        ]
+        self._span = self.doc[self.start : self.end]
+        self._scope_span = self.doc[self._scope_start : self._scope_end]
+
+    # TagObjects are ordered by their start token index only, like spaCy 2.x Spans,
+    # which compare by start character. Modifiers which start at the same token
+    # are equal and don't limit each other's scope.
     def __gt__(self, other):
-        return self.span > other.span
+        return self.start > other.start
 
     def __ge__(self, other):
-        return self.span >= other.span
+        return self.start >= other.start
 
     def __lt__(self, other):
-        return self.span < other.span
+        return self.start < other.start
 
     def __le__(self, other):
-        return self.span <= other.span
+        return self.start <= other.start
 
     def __len__(self):
-        return len(self.span)
+        return self.end - self.start
 
     def __repr__(self):
         return f"<TagObject> [{self.span}, {self.category}]"
+
+
+def _set_scope_forward(tag_object, sent_start, sent_end):
+    """Set the scope of a TagObject from its end to the end of its sentence."""
+    scope_end = sent_end
+    max_scope = tag_object.max_scope
+    if max_scope is not None and (scope_end - tag_object.end) > max_scope:
+        scope_end = tag_object.end + max_scope
+    tag_object._scope_start, tag_object._scope_end = tag_object.end, scope_end
+
+
+def _set_scope_backward(tag_object, sent_start, sent_end):
+    """Set the scope of a TagObject from the start of its sentence to its start."""
+    scope_start = sent_start
+    max_scope = tag_object.max_scope
+    if max_scope is not None and (tag_object.start - scope_start) > max_scope:
+        scope_start = tag_object.start - max_scope
+    tag_object._scope_start, tag_object._scope_end = scope_start, tag_object.start
+
+
+def _set_scope_bidirectional(tag_object, sent_start, sent_end):
+    """Set the scope of a TagObject to its whole sentence,
+    limited to max_scope tokens on either side.
+    """
+    scope_start, scope_end = sent_start, sent_end
+    max_scope = tag_object.max_scope
+    if max_scope is not None:
+        if (tag_object.start - scope_start) > max_scope:
+            scope_start = tag_object.start - max_scope
+        if (scope_end - tag_object.end) > max_scope:
+            scope_end = tag_object.end + max_scope
+    tag_object._scope_start, tag_object._scope_end = scope_start, scope_end
+
+
+# Maps each rule to the function which sets the scope of a TagObject with that rule.
+# Any rule other than forward or backward is bidirectional.
+_SCOPE_SETTERS = {
+    FORWARD: _set_scope_forward,
+    BACKWARD: _set_scope_backward,
+    BIDIRECTIONAL: _set_scope_bidirectional,
+    TERMINATE: _set_scope_bidirectional,
+    MAX_TARGETS: _set_scope_bidirectional,
+    MAX_SCOPE: _set_scope_bidirectional,
+}
+
+
+_NO_SENTENCES_MESSAGE = (
+    "ConText failed because sentence boundaries have not been set. "
+    "Add an upstream component such as the dependency parser, Sentencizer, or PyRuSH to detect sentence boundaries."
+)
+
+
+def sentence_bounds(doc):
+    """Returns lists of the start and end token indices of the sentences in a Doc.
+    These should be computed once per Doc and passed to each TagObject, so that each
+    TagObject can find its sentence with a binary search instead of walking the Doc's tokens.
+    """
+    try:
+        sents = list(doc.sents)
+    except ValueError:  # spaCy raises an error if sentence boundaries are unset
+        sents = []
+    if not sents:
+        raise ValueError(_NO_SENTENCES_MESSAGE)
+    return [sent.start for sent in sents], [sent.end for sent in sents]
+
+
+def _token_sent(token):
+    """Returns the sentence Span which contains a token."""
+    try:
+        sent = token.sent
+    except ValueError:  # spaCy raises an error if sentence boundaries are unset
+        sent = None
+    if sent is None:
+        raise ValueError(_NO_SENTENCES_MESSAGE)
+    return sent
+
+
+def target_label_id(target):
+    """Returns the StringStore ID of the upper-cased label of a target Span.
+    Target labels are matched case-insensitively against allowed_types and excluded_types,
+    so this should be computed once per target rather than once per modifier.
+    """
+    return hash_string(target.label_.upper())
@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import setup, Extension
 
 # read the contents of the README file
 from os import path
@@ -7,6 +7,28 @@ this_directory = path.abspath(path.dirname(__file__))
 with open(path.join(this_directory, "README.md"), encoding="utf-8") as f:
     long_description = f.read()
 
+# Build the compiled TagObject methods if Cython and a C compiler are available.
+# Otherwise cycontext falls back to the pure-Python implementation.
+tag_object_pyx = "cycontext/_tag_object.pyx"
+tag_object_c = "cycontext/_tag_object.c"
+ext_modules = []
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    pass
+else:
+    if path.exists(path.join(this_directory, tag_object_pyx)):
+        ext_modules = cythonize(
+            [Extension("cycontext._tag_object", [tag_object_pyx])], language_level=3,
+        )
+# Fall back to the generated C source, which is shipped in source distributions
+if not ext_modules and path.exists(path.join(this_directory, tag_object_c)):
+    ext_modules = [Extension("cycontext._tag_object", [tag_object_c])]
+# Skip the extension instead of failing the install if it can't be compiled.
+# This is set after cythonize, which doesn't copy the optional flag.
+for ext in ext_modules:
+    ext.optional = True
+
 setup(
     name="cycontext",
     version="1.0.3.1",
@@ -15,7 +37,13 @@ setup(
     author_email="medspacy.dev@gmail.com",
     packages=["cycontext"],
     install_requires=["spacy>=2.2.2", "jsonschema"],
+    extras_require={
+        "speedups": ["orjson", "numba"],
+        "orjson": ["orjson"],
+        "numba": ["numba"],
+    },
     long_description=long_description,
     long_description_content_type="text/markdown",
     package_data={"cycontext": ["../kb/*"]},
+    ext_modules=ext_modules,
 )
@@ -255,6 +255,24 @@ class TestConTextComponent:
         context.add([item])
         assert item.allowed_types == {"PROBLEM"}
 
+    def test_same_start_modifiers_no_prune(self):
+        """Check that if two modifiers start at the same token and aren't pruned,
+        neither one limits the scope of the other.
+        """
+        context = ConTextComponent(nlp, rules=None, prune=False)
+        context.add(
+            [
+                ConTextItem("no", "NEGATED_EXISTENCE", "FORWARD"),
+                ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD"),
+            ]
+        )
+        doc = nlp("There is no evidence of pneumonia.")
+        doc.ents = (Span(doc, 5, 6, "CONDITION"),)
+        context(doc)
+        modifiers = doc._.context_graph.modifiers
+        assert sorted((modifier.start, modifier.end) for modifier in modifiers) == [(2, 3), (2, 5)]
+        assert len(doc.ents[0]._.modifiers) == 2
+
     def test_context_modifier_termination(self):
         context = ConTextComponent(nlp, rules=None, terminations={"NEGATED_EXISTENCE": ["POSITIVE_EXISTENCE", "UNCERTAIN"]})
         item = ConTextItem(
@@ -4,7 +4,7 @@ import spacy
 from cycontext import ConTextComponent
 from cycontext import ConTextItem
 from cycontext.tag_object import TagObject
-from cycontext.context_graph import ConTextGraph
+from cycontext.context_graph import ConTextGraph, ModifierIndex
 from spacy.tokens import Span
 from cycontext.context_graph import overlap_target_modifiers
 
@@ -83,3 +83,12 @@ class TestConTextGraph:
 
         assert overlap_target_modifiers(tag_object.span, doc.ents[0])
         assert len(graph.modifiers) == 1
+
+    def test_modifier_index_query(self):
+        """Test that the ModifierIndex only returns modifiers whose scope overlaps a target."""
+        doc = nlp("There is no evidence of pneumonia. She has chf.")
+        item = ConTextItem("no evidence of", "DEFINITE_NEGATED_EXISTENCE", "forward")
+        tag_object = TagObject(item, 2, 5, doc)
+        modifier_index = ModifierIndex([tag_object])
+        assert modifier_index.query(doc[5:6]) == [tag_object]  # "pneumonia"
+        assert modifier_index.query(doc[9:10]) == []  # "chf"
@@ -1,6 +1,8 @@
 import pytest
+import spacy
 
 from cycontext import ConTextItem
+from cycontext.context_item import FORWARD
 
 
 class TestItemData:
@@ -26,6 +28,11 @@ class TestItemData:
         item = ConTextItem(literal, category, rule)
         assert item.rule == "FORWARD"
 
+    def test_context_item_rule_interned(self):
+        """Test that a ConTextItem rule is the interned rule constant"""
+        item = ConTextItem("no evidence of", "definite_negated_existence", "forward")
+        assert item.rule is FORWARD
+
     def test_rule_value_error(self):
         """Test that ConTextItem raises a ValueError if an invalid rule is passed in."""
         literal = "no evidence of"
@@ -68,6 +75,14 @@ class TestItemData:
         item = ConTextItem(literal, category, rule)
         assert isinstance(item.to_dict(), dict)
 
+    def test_to_dict_values(self):
+        item = ConTextItem("no evidence of", "definite_negated_existence", "forward")
+        item_dict = item.to_dict()
+        assert item_dict["literal"] == "no evidence of"
+        assert item_dict["category"] == "DEFINITE_NEGATED_EXISTENCE"
+        assert item_dict["rule"] == "FORWARD"
+        assert item_dict["excluded_types"] is None
+
     def test_to_json(self):
         import json, os
 
@@ -87,6 +102,73 @@ class TestItemData:
 
         os.remove("test_modifiers.json")
 
+    def test_type_ids(self):
+        vocab = spacy.blank("en").vocab
+        item = ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD", allowed_types={"problem"})
+        assert item._allowed_type_ids == frozenset({vocab.strings.add("PROBLEM")})
+        assert item._excluded_type_ids is None
+
+    def test_reassign_allowed_types(self):
+        item = ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD", allowed_types={"problem"})
+        item.allowed_types = {"treatment"}
+        assert item.allowed_types == {"TREATMENT"}
+        assert item._allowed_type_ids == frozenset({spacy.strings.hash_string("TREATMENT")})
+        item.allowed_types = None
+        assert item._allowed_type_ids is None
+
+    def test_to_json_from_json(self):
+        import os
+
+        item = ConTextItem("no evidence of", "definite_negated_existence", "forward")
+        ConTextItem.to_json([item], "test_modifiers.json")
+        items = ConTextItem.from_json("test_modifiers.json")
+        os.remove("test_modifiers.json")
+        assert len(items) == 1
+        assert items[0].literal == item.literal
+        assert items[0].category == item.category
+        assert items[0].rule == item.rule
+
+    def test_pickle(self):
+        import pickle
+
+        item = ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD", excluded_types={"problem"})
+        state = item.__getstate__()
+        assert "_excluded_type_ids" not in state
+        item2 = pickle.loads(pickle.dumps(item))
+        assert item2.rule == FORWARD
+        assert item2.excluded_types == {"PROBLEM"}
+        assert item2._excluded_type_ids == item._excluded_type_ids
+
+    def test_to_json_non_str_keys(self):
+        import json, os
+
+        item = ConTextItem("no evidence of", "definite_negated_existence", "forward", metadata={1: "code"})
+        ConTextItem.to_json([item], "test_modifiers.json")
+        with open("test_modifiers.json") as f:
+            data = json.load(f)
+        os.remove("test_modifiers.json")
+        assert data["item_data"][0]["metadata"] == {"1": "code"}
+
+    def test_to_json_from_json_types(self):
+        import os
+
+        items = [
+            ConTextItem("no evidence of", "negated_existence", "forward", allowed_types={"problem", "condition"}),
+            ConTextItem(
+                "history of", "historical", "forward", excluded_types={"treatment"}, terminated_by={"negated_existence"}
+            ),
+        ]
+        assert items[0].to_dict()["allowed_types"] == ["CONDITION", "PROBLEM"]
+        ConTextItem.to_json(items, "test_modifiers.json")
+        items2 = ConTextItem.from_json("test_modifiers.json")
+        os.remove("test_modifiers.json")
+        assert items2[0].allowed_types == {"CONDITION", "PROBLEM"}
+        assert items2[0].excluded_types is None
+        assert items2[1].allowed_types is None
+        assert items2[1].excluded_types == {"TREATMENT"}
+        assert items2[0].terminated_by == frozenset()
+        assert items2[1].terminated_by == frozenset({"NEGATED_EXISTENCE"})
+
     def test_default_terminate(self):
         item = ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD", terminated_by=None)
         assert item.terminated_by == set()
@@ -95,6 +177,10 @@ class TestItemData:
         item = ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD", terminated_by={"POSITIVE_EXISTENCE"})
         assert item.terminated_by == {"POSITIVE_EXISTENCE"}
 
+    def test_terminate_frozenset(self):
+        item = ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD", terminated_by=["positive_existence"])
+        assert item.terminated_by == frozenset({"POSITIVE_EXISTENCE"})
+
 
 @pytest.fixture
 def from_json_file():
@@ -0,0 +1,51 @@
+import pytest
+import spacy
+
+from cycontext import ConTextComponent, ConTextItem
+from cycontext.pipe import tag_documents
+
+nlp = spacy.load("en_core_web_sm")
+
+
+class TestPipe:
+    def context(self):
+        context = ConTextComponent(nlp, rules=None)
+        context.add([ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD")])
+        return context
+
+    def test_tag_documents(self):
+        texts = ["There is no evidence of pneumonia.", "She has a cough."]
+        docs = list(tag_documents(nlp, texts, context=self.context()))
+        assert len(docs) == 2
+        assert len(docs[0]._.context_graph.modifiers) == 1
+        assert len(docs[1]._.context_graph.modifiers) == 0
+
+    @pytest.mark.slow
+    def test_tag_documents_multiple_processes(self):
+        texts = ["There is no evidence of pneumonia."] * 4
+        docs = list(
+            tag_documents(nlp, texts, context=self.context(), n_process=2, batch_size=2)
+        )
+        assert len(docs) == 4
+        for doc in docs:
+            assert len(doc._.context_graph.modifiers) == 1
+
+    def test_tag_documents_components_after_context(self):
+        nlp2 = spacy.load("en_core_web_sm")
+        context = ConTextComponent(nlp2, rules=None)
+        context.add([ConTextItem("no evidence of", "NEGATED_EXISTENCE", "FORWARD")])
+        num_modifiers = []
+
+        def count_modifiers(doc):
+            num_modifiers.append(len(doc._.context_graph.modifiers))
+            return doc
+
+        nlp2.add_pipe(context)
+        nlp2.add_pipe(count_modifiers)
+        docs = list(tag_documents(nlp2, ["There is no evidence of pneumonia."]))
+        assert len(docs) == 1
+        assert num_modifiers == [1]
+
+    def test_tag_documents_no_context(self):
+        with pytest.raises(ValueError):
+            list(tag_documents(nlp, ["There is no evidence of pneumonia."]))
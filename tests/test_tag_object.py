@@ -1,14 +1,45 @@
+import numpy as np
 import pytest
 import spacy
 from spacy.tokens import Span
 
 from cycontext import ConTextItem, ConTextComponent
-from cycontext.tag_object import TagObject
+from cycontext import context_component, tag_object as tag_object_module
+from cycontext.tag_object import TagObject, _PyTagObjectBase, _closest_targets, sentence_bounds
 from cycontext.helpers import is_modified_by
 
+try:
+    from cycontext._tag_object import TagObjectBase
+except ImportError:
+    TagObjectBase = None
+
 nlp = spacy.load("en_core_web_sm")
 
 
+def _tag_object_class(base):
+    """Returns a copy of TagObject which inherits from base."""
+    if base is TagObject.__base__:
+        return TagObject
+    namespace = {
+        name: value
+        for (name, value) in vars(TagObject).items()
+        if name not in TagObject.__slots__
+    }
+    return type(TagObject.__name__, (base,), namespace)
+
+
+@pytest.fixture(autouse=True, params=[_PyTagObjectBase, TagObjectBase], ids=["python", "compiled"])
+def tag_object_base(request, monkeypatch):
+    """Runs each test with both the pure-Python and compiled TagObject base classes."""
+    if request.param is None:
+        pytest.skip("cycontext._tag_object has not been built")
+    cls = _tag_object_class(request.param)
+    monkeypatch.setattr(tag_object_module, "TagObject", cls)
+    monkeypatch.setattr(context_component, "TagObject", cls)
+    monkeypatch.setitem(globals(), "TagObject", cls)
+    return request.param
+
+
 class TestTagObject:
     def create_objects(self):
         doc = nlp("family history of breast cancer but no diabetes. She has afib.")
@@ -82,6 +113,25 @@ class TestTagObject:
         tag_object2 = TagObject(item2, 5, 7, doc)
         assert tag_object.limit_scope(tag_object2)
 
+    def test_no_limit_scope_different_sentences(self):
+        """Test that a modifier in another sentence does not limit the scope."""
+        doc = nlp("No evidence of chf. Neg for pneumonia.")
+        item = ConTextItem("no evidence of", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        item2 = ConTextItem("neg for", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        tag_object = TagObject(item, 0, 3, doc)
+        tag_object2 = TagObject(item2, 5, 7, doc)
+        assert not tag_object.limit_scope(tag_object2)
+
+    def test_limit_scope_updates_scope(self):
+        """Test that the scope Span reflects a limited scope."""
+        doc = nlp("no evidence of CHF, neg for pneumonia")
+        item = ConTextItem("no evidence of", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        item2 = ConTextItem("neg for", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        tag_object = TagObject(item, 0, 3, doc)
+        tag_object2 = TagObject(item2, 5, 7, doc)
+        tag_object.limit_scope(tag_object2)
+        assert tag_object.scope == doc[3:5]
+
     def test_terminate_limit_scope_custom(self):
         """Test that a modifier will be explicitly terminated by a modifier with a category
         in terminated_by."""
@@ -126,6 +176,14 @@ class TestTagObject:
         assert len(chf._.modifiers) > 0
         assert len(pneumonia._.modifiers) == 0
 
+    def test_terminate_not_interned(self):
+        """Test that a TERMINATE rule which isn't the interned constant doesn't modify targets."""
+        doc = nlp("No evidence of chf but she has pneumonia.")
+        item = ConTextItem("but", "TERMINATE", "TERMINATE")
+        item.rule = "".join(["TERMI", "NATE"])
+        tag_object = TagObject(item, 4, 5, doc)
+        assert not tag_object.modifies(Span(doc, 5, 6, "PROBLEM"))
+
     def test_terminate_stops_backward_modifier(self):
         context = ConTextComponent(nlp, rules=None)
 
@@ -202,6 +260,17 @@ class TestTagObject:
             "Add an upstream component such as the dependency parser, Sentencizer, or PyRuSH to detect sentence boundaries."
         )
 
+    def test_sentence_bounds(self):
+        """Test that a TagObject finds its sentence with or without precomputed sentence boundaries."""
+        doc, item, tag_object = self.create_objects()
+        sent_starts, sent_ends = sentence_bounds(doc)
+        assert sent_starts == [sent.start for sent in doc.sents]
+        assert sent_ends == [sent.end for sent in doc.sents]
+        assert (tag_object._sent_start, tag_object._sent_end) == (0, 9)
+        tag_object2 = TagObject(item, 10, 11, doc, (sent_starts, sent_ends))
+        assert (tag_object2._sent_start, tag_object2._sent_end) == (9, 13)
+        assert not doc.user_data
+
     def test_update_scope(self):
         doc, item, tag_object = self.create_objects()
         tag_object.update_scope(doc[3:5])
@@ -264,6 +333,21 @@ class TestTagObject:
         assert tag_object.modifies(travel) is True
         assert tag_object.modifies(condition) is True
 
+    def test_allowed_types_case_insensitive(self):
+        """Test that allowed_types are matched regardless of the case of the target label."""
+        doc = nlp("no history of travel to Puerto Rico pneumonia")
+        doc.ents = (Span(doc, 5, 7, "travel"), Span(doc, 7, 8, "condition"))
+        item = ConTextItem(
+            "no history of travel to",
+            category="DEFINITE_NEGATED_EXISTENCE",
+            rule="FORWARD",
+            allowed_types={"TRAVEL"},
+        )
+        tag_object = TagObject(item, 0, 5, doc)
+        travel, condition = doc.ents
+        assert tag_object.modifies(travel) is True
+        assert tag_object.modifies(condition) is False
+
     def test_max_targets_less_than_targets(self):
         """Check that if max_targets is not None it will reduce the targets
         to the two closest ents.
@@ -320,6 +404,19 @@ class TestTagObject:
         tag_object.reduce_targets()
         assert tag_object.num_targets == 3
 
+    def test_closest_targets(self):
+        """Check that the top-k selection used for large numbers of targets
+        returns the closest targets, keeping the earlier target on ties.
+        """
+        pytest.importorskip("numba")
+        starts = np.array([2, 4, 6, 0], dtype=np.int64)
+        ends = np.array([3, 5, 7, 1], dtype=np.int64)
+        # The modifier is "vs" in "Pt with diabetes, pneumonia vs COPD"
+        closest = _closest_targets(5, 6, starts, ends, 2)
+        assert list(closest) == [1, 2]
+        closest = _closest_targets(5, 6, starts, ends, 3)
+        assert list(closest) == [1, 2, 0]
+
     def test_max_scope(self):
         """Test that if max_scope is not None it will reduce the range
         of text which is modified.
@@ -354,6 +451,48 @@ class TestTagObject:
                 tag_object.modify(target)
         assert tag_object.num_targets == 3
 
+    def test_pickle(self):
+        """Test that a TagObject keeps its span, scope and targets when pickled."""
+        import pickle
+
+        doc, item, tag_object = self.create_objects()
+        tag_object.modify(doc[3:5])
+        tag_object2 = pickle.loads(pickle.dumps(tag_object))
+        assert (tag_object2.start, tag_object2.end) == (0, 3)
+        assert tag_object2.span.text == tag_object.span.text
+        assert tag_object2.scope.text == tag_object.scope.text
+        assert tag_object2.rule == tag_object.rule
+        assert [target.text for target in tag_object2._targets] == ["breast cancer"]
+
+    def test_ordering(self):
+        """Test that TagObjects are ordered by their position in the Doc."""
+        doc = nlp("no evidence of CHF, neg for pneumonia")
+        item = ConTextItem("no evidence of", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        item2 = ConTextItem("neg for", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        tag_object = TagObject(item, 0, 3, doc)
+        tag_object2 = TagObject(item2, 5, 7, doc)
+        assert tag_object2 > tag_object
+        assert tag_object2 >= tag_object
+        assert tag_object < tag_object2
+        assert tag_object <= tag_object2
+        assert sorted([tag_object2, tag_object]) == [tag_object, tag_object2]
+
+    def test_ordering_same_start(self):
+        """Test that TagObjects which start at the same token are equal
+        and don't limit each other's scope.
+        """
+        doc = nlp("There is no evidence of pneumonia.")
+        item = ConTextItem("no", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        item2 = ConTextItem("no evidence of", "DEFINITE_NEGATED_EXISTENCE", "FORWARD")
+        tag_object = TagObject(item, 2, 3, doc)
+        tag_object2 = TagObject(item2, 2, 5, doc)
+        assert not tag_object2 > tag_object
+        assert not tag_object < tag_object2
+        assert tag_object <= tag_object2 and tag_object >= tag_object2
+        assert tag_object.limit_scope(tag_object2) is False
+        assert tag_object2.limit_scope(tag_object) is False
+        assert tag_object.modifies(doc[5:6])
+
     def test_overlapping_target(self):
         """Test that a modifier will not modify a target if it is
         in the same span as the modifier.